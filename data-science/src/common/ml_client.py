@@ -7,12 +7,24 @@ Relies on the standard AzureML injected environment variables inside a job:
 """
 
 import os
-import sys
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+import threading
+from azure.identity import DefaultAzureCredential
 from azure.ai.ml import MLClient
 
+# Credential and client are cached for the lifetime of the process so the
+# credential chain walk and token probe only happen once; azure-identity
+# keeps tokens cached in-memory on the credential object itself.
+_CRED = None
+_ML_CLIENT = None
+_LOCK = threading.Lock()
+
 
 def get_ml_client():
+    global _CRED, _ML_CLIENT
+
+    if _ML_CLIENT is not None:
+        return _ML_CLIENT
+
     subscription_id = os.getenv("AZUREML_ARM_SUBSCRIPTION")
     resource_group = os.getenv("AZUREML_ARM_RESOURCEGROUP")
     workspace_name = os.getenv("AZUREML_ARM_WORKSPACE_NAME")
@@ -21,12 +33,12 @@ def get_ml_client():
             "Missing one or more AzureML workspace environment variables: "
             "AZUREML_ARM_SUBSCRIPTION, AZUREML_ARM_RESOURCEGROUP, AZUREML_ARM_WORKSPACE_NAME"
         )
-    try:
-        cred = DefaultAzureCredential(exclude_interactive_browser_credential=True)
-        # Probe token quickly (management scope)
-        cred.get_token("https://management.azure.com/.default")
-        print("Acquired token using DefaultAzureCredential", file=sys.stderr)
-    except Exception as e:
-        print(f"DefaultAzureCredential failed: {e}; attempting ManagedIdentityCredential", file=sys.stderr)
-        cred = ManagedIdentityCredential()
-    return MLClient(cred, subscription_id, resource_group, workspace_name)
+
+    with _LOCK:
+        if _ML_CLIENT is not None:
+            return _ML_CLIENT
+        # No eager token probe: MLClient acquires tokens lazily on first use,
+        # and DefaultAzureCredential already chains to managed identity.
+        _CRED = DefaultAzureCredential(exclude_interactive_browser_credential=True)
+        _ML_CLIENT = MLClient(_CRED, subscription_id, resource_group, workspace_name)
+    return _ML_CLIENT
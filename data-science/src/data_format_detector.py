@@ -5,18 +5,154 @@ Automatically detect the format of input dataset (COCO, YOLO, etc.)
 """
 
 import os
+import sys
 import json
 import logging
-import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import glob
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Directories already created this process; avoids re-statting the
+# directory chain before every report write
+_ensured_dirs = set()
+
+
+def _ensure_dir(path: str):
+    """os.makedirs(exist_ok=True), memoized per process."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def _write_json(path: str, obj: dict):
+    """Serialize obj to path, preferring orjson when available."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"})
+
+# Top-level keys marking a (partial) COCO annotation file; built once
+# instead of per inspected JSON file
+_COCO_KEYS = frozenset({"images", "annotations", "categories"})
+_COCO_PARTIAL_KEYS = frozenset({"images", "annotations"})
+
+
+def _iter_files(root: Path):
+    """Walk the tree once with os.scandir, yielding one directory at a time.
+
+    A single traversal replaces the per-extension glob patterns, which each
+    re-walked the whole tree (and double-counted top-level files). Each yield
+    is a list of (suffix, path) pairs for one directory, so callers see all
+    of a file's siblings together, and the generator form lets them abandon
+    the walk early once enough format indicators have been collected.
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        files = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    # rfind + slice beats os.path.splitext in this hot loop
+                    name = entry.name
+                    dot = name.rfind(".")
+                    suffix = name[dot:].lower() if dot > 0 else ""
+                    files.append((suffix, Path(entry.path)))
+        except OSError as e:
+            logger.warning(f"Could not scan directory {current}: {e}")
+            continue
+        if files:
+            yield files
+
+
+def _inspect_json(path: Path):
+    """Score a JSON file for COCO structure.
+
+    Returns (score, detection_logic_messages, files_analyzed_paths) so the
+    caller can aggregate results from concurrently inspected files.
+    """
+    try:
+        with open(path, "r") as f:
+            # Cheap head check first: COCO files expose their top-level keys
+            # in the first few KB, so this often settles the question without
+            # parsing a potentially huge annotation file.
+            head = f.read(4096)
+            if head.lstrip().startswith("{") and all(
+                f'"{key}"' in head for key in _COCO_KEYS
+            ):
+                data = None
+                is_coco = True
+            else:
+                # Ambiguous head; fall back to a full parse
+                f.seek(0)
+                if orjson is not None:
+                    data = orjson.loads(f.read())
+                else:
+                    data = json.load(f)
+                is_coco = isinstance(data, dict) and _COCO_KEYS.issubset(data)
+
+        # Check for COCO structure
+        if is_coco:
+            return 3, [f"Found COCO structure in {path.name}"], [str(path)]
+        if isinstance(data, dict) and not _COCO_PARTIAL_KEYS.isdisjoint(data):
+            return 1, [f"Found partial COCO structure in {path.name}"], []
+
+    except Exception as e:
+        logger.warning(f"Could not parse JSON file {path}: {e}")
+    return 0, [], []
+
+
+def _inspect_yolo_annotations(annotation_file: Path) -> bool:
+    """Check whether a known annotation file holds YOLO-style lines."""
+    try:
+        # Stream lines instead of slurping the file; one valid line is
+        # enough, so dense annotation files cost a single buffered read.
+        with open(annotation_file, "r", buffering=65536) as f:
+            # Check YOLO format (class_id x_center y_center width height)
+            for line in f:
+                parts = line.split(None, 5)
+                if len(parts) < 5:
+                    continue
+                try:
+                    # Check if coordinates are normalized (0-1 range)
+                    xc = float(parts[1])
+                    yc = float(parts[2])
+                    bw = float(parts[3])
+                    bh = float(parts[4])
+                except ValueError:
+                    continue
+                if (
+                    0.0 <= xc <= 1.0
+                    and 0.0 <= yc <= 1.0
+                    and 0.0 <= bw <= 1.0
+                    and 0.0 <= bh <= 1.0
+                ):
+                    return True
+    except Exception as e:
+        logger.warning(f"Could not read annotation file {annotation_file}: {e}")
+    return False
+
+
 def detect_data_format(input_data: str, format_info: str, format_report: str):
     """
     Detect the format of input dataset.
@@ -56,12 +192,10 @@ def detect_data_format(input_data: str, format_info: str, format_report: str):
 
         # Write fallback results
         try:
-            os.makedirs(os.path.dirname(format_info), exist_ok=True)
-            with open(format_info, "w") as f:
-                json.dump(detection_results, f, indent=2)
-            os.makedirs(os.path.dirname(format_report), exist_ok=True)
-            with open(format_report, "w") as f:
-                json.dump(detailed_report, f, indent=2)
+            _ensure_dir(os.path.dirname(format_info))
+            _write_json(format_info, detection_results)
+            _ensure_dir(os.path.dirname(format_report))
+            _write_json(format_report, detailed_report)
         except Exception as e:
             logger.error(f"Failed to write fallback results: {e}")
         return
@@ -92,95 +226,113 @@ def detect_data_format(input_data: str, format_info: str, format_report: str):
 
         logger.info("Checking for file structure indicators...")
 
-        # Get list of files with error handling
-        try:
-            all_files = list(input_path.rglob("*"))
-            detailed_report["files_analyzed"] = [
-                str(f) for f in all_files[:20]
-            ]  # Limit for report size
-            logger.info(f"Found {len(all_files)} files to analyze")
-        except Exception as e:
-            logger.warning(f"Error listing files: {e}")
-            all_files = []
-
-        # Look for COCO annotation files (JSON)
-        json_files = list(input_path.glob("*.json")) + list(
-            input_path.glob("**/*.json")
-        )
-        for json_file in json_files:
-            try:
-                with open(json_file, "r") as f:
-                    data = json.load(f)
-
-                # Check for COCO structure
-                if isinstance(data, dict) and all(
-                    key in data for key in ["images", "annotations", "categories"]
-                ):
-                    coco_indicators += 3
-                    detailed_report["detection_logic"].append(
-                        f"Found COCO structure in {json_file.name}"
-                    )
-                    detailed_report["files_analyzed"].append(str(json_file))
-                elif isinstance(data, dict) and any(
-                    key in data for key in ["images", "annotations"]
-                ):
-                    coco_indicators += 1
-                    detailed_report["detection_logic"].append(
-                        f"Found partial COCO structure in {json_file.name}"
-                    )
-
-            except Exception as e:
-                logger.warning(f"Could not parse JSON file {json_file}: {e}")
-
-        # Look for YOLO format indicators
-        txt_files = list(input_path.glob("*.txt")) + list(input_path.glob("**/*.txt"))
-        classes_file = None
-
-        # Check for classes.txt or similar
-        for txt_file in txt_files:
-            if txt_file.name.lower() in ["classes.txt", "class.names", "obj.names"]:
-                classes_file = txt_file
-                yolo_indicators += 2
-                detailed_report["detection_logic"].append(
-                    f"Found YOLO classes file: {txt_file.name}"
-                )
-                detailed_report["files_analyzed"].append(str(txt_file))
-
-        # Check for YOLO annotation files (txt files with normalized coordinates)
-        image_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"}
+        # Inspect files as the traversal yields them so we can stop as soon
+        # as the indicators are conclusive, instead of walking the full tree.
+        # File inspection is I/O-bound (datasets usually sit on a network
+        # mount), so the reads run in a thread pool while the main thread
+        # keeps walking and folds in results as they complete.
+        json_files = []
+        txt_files = []
         image_files = []
-        for ext in image_extensions:
-            image_files.extend(input_path.glob(f"*{ext}"))
-            image_files.extend(input_path.glob(f"**/*{ext}"))
-
+        classes_file = None
         yolo_annotation_count = 0
-        for img_file in image_files[:10]:  # Check first 10 images
-            annotation_file = img_file.with_suffix(".txt")
-            if annotation_file.exists():
-                try:
-                    with open(annotation_file, "r") as f:
-                        lines = f.readlines()
-
-                    # Check YOLO format (class_id x_center y_center width height)
-                    valid_yolo_lines = 0
-                    for line in lines:
-                        parts = line.strip().split()
-                        if len(parts) >= 5:
-                            try:
-                                # Check if coordinates are normalized (0-1 range)
-                                coords = [float(x) for x in parts[1:5]]
-                                if all(0 <= coord <= 1 for coord in coords):
-                                    valid_yolo_lines += 1
-                            except ValueError:
-                                continue
-
-                    if valid_yolo_lines > 0:
-                        yolo_annotation_count += 1
-
-                except Exception as e:
-                    logger.warning(
-                        f"Could not read annotation file {annotation_file}: {e}"
+        images_checked = 0
+        stopped_early = False
+        total_scanned = 0
+        scanned_sample = []
+
+        def _fold(kind, result):
+            nonlocal coco_indicators, yolo_annotation_count
+            if kind == "json":
+                score, logic, analyzed = result
+                coco_indicators += score
+                detailed_report["detection_logic"].extend(logic)
+                detailed_report["files_analyzed"].extend(analyzed)
+            elif result:
+                yolo_annotation_count += 1
+
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = []
+            txt_by_stem = {}
+            for entries in _iter_files(input_path):
+                # Record txt siblings first, keyed by path-without-extension,
+                # so image pairing below is a dict probe instead of a stat
+                # syscall per image.
+                for suffix, path in entries:
+                    if suffix == ".txt":
+                        txt_by_stem[str(path)[:-4]] = path
+
+                for suffix, path in entries:
+                    total_scanned += 1
+                    # Bounded sample for the report; never materialize the
+                    # full file list just to slice 20 entries
+                    if len(scanned_sample) < 20:
+                        scanned_sample.append(str(path))
+                    if suffix == ".json":
+                        json_files.append(path)
+                        pending.append(("json", executor.submit(_inspect_json, path)))
+
+                    elif suffix == ".txt":
+                        txt_files.append(path)
+                        # Check for classes.txt or similar
+                        if path.name.lower() in [
+                            "classes.txt",
+                            "class.names",
+                            "obj.names",
+                        ]:
+                            classes_file = path
+                            yolo_indicators += 2
+                            detailed_report["detection_logic"].append(
+                                f"Found YOLO classes file: {path.name}"
+                            )
+                            detailed_report["files_analyzed"].append(str(path))
+
+                    elif suffix in IMAGE_EXTENSIONS:
+                        image_files.append(path)
+                        # Check YOLO annotations for the first 10 images only
+                        if images_checked < 10:
+                            images_checked += 1
+                            annotation_file = txt_by_stem.get(str(path)[: -len(suffix)])
+                            if annotation_file is not None:
+                                pending.append(
+                                    (
+                                        "yolo",
+                                        executor.submit(
+                                            _inspect_yolo_annotations, annotation_file
+                                        ),
+                                    )
+                                )
+
+                # Fold in whatever finished so the early-exit check sees it
+                still_pending = []
+                for kind, fut in pending:
+                    if fut.done():
+                        _fold(kind, fut.result())
+                    else:
+                        still_pending.append((kind, fut))
+                pending = still_pending
+
+                # Either signal alone is enough for a confident decision below;
+                # abandon the walk instead of enumerating the rest of the tree.
+                if coco_indicators >= 3 or yolo_annotation_count >= 3:
+                    detailed_report["detection_logic"].append(
+                        "Stopped traversal early: sufficient format indicators"
                     )
+                    stopped_early = True
+                    break
+
+            for kind, fut in pending:
+                if stopped_early:
+                    fut.cancel()
+                else:
+                    _fold(kind, fut.result())
+
+        # Sample of scanned files ahead of the notable hits appended above
+        detailed_report["files_analyzed"] = (
+            scanned_sample + detailed_report["files_analyzed"]
+        )
+        logger.info(f"Scanned {total_scanned} files")
 
         if yolo_annotation_count >= 3:  # If at least 3 images have YOLO annotations
             yolo_indicators += 3
@@ -242,18 +394,16 @@ def detect_data_format(input_data: str, format_info: str, format_report: str):
 
     # Write format detection results with error handling
     try:
-        os.makedirs(os.path.dirname(format_info), exist_ok=True)
-        with open(format_info, "w") as f:
-            json.dump(detection_results, f, indent=2)
+        _ensure_dir(os.path.dirname(format_info))
+        _write_json(format_info, detection_results)
         logger.info(f"Successfully wrote format info to: {format_info}")
     except Exception as e:
         logger.error(f"Failed to write format info: {e}")
 
     # Write detailed report with error handling
     try:
-        os.makedirs(os.path.dirname(format_report), exist_ok=True)
-        with open(format_report, "w") as f:
-            json.dump(detailed_report, f, indent=2)
+        _ensure_dir(os.path.dirname(format_report))
+        _write_json(format_report, detailed_report)
         logger.info(f"Successfully wrote format report to: {format_report}")
     except Exception as e:
         logger.error(f"Failed to write format report: {e}")
@@ -264,17 +414,45 @@ def detect_data_format(input_data: str, format_info: str, format_report: str):
     )
 
 
-def main():
-    """Main function for command-line usage."""
+def _parse_argv(argv):
+    """Parse the fixed flag set by hand; argparse is slow to import and
+    construct, so it is only pulled in for --help or malformed input."""
+    flags = {
+        "--input-data": "input_data",
+        "--format-info": "format_info",
+        "--format-report": "format_report",
+    }
+    if "-h" not in argv and "--help" not in argv and len(argv) == 6:
+        parsed = {}
+        for flag, value in zip(argv[0::2], argv[1::2]):
+            name = flags.get(flag)
+            if name is None:
+                break
+            parsed[name] = value
+        else:
+            if len(parsed) == 3:
+                return parsed
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="Detect data format (COCO/YOLO)")
     parser.add_argument("--input-data", required=True, help="Input dataset folder")
     parser.add_argument("--format-info", required=True, help="Format info output file")
     parser.add_argument(
         "--format-report", required=True, help="Detailed report output file"
     )
+    args = parser.parse_args(argv)
+    return {
+        "input_data": args.input_data,
+        "format_info": args.format_info,
+        "format_report": args.format_report,
+    }
 
-    args = parser.parse_args()
-    detect_data_format(args.input_data, args.format_info, args.format_report)
+
+def main():
+    """Main function for command-line usage."""
+    args = _parse_argv(sys.argv[1:])
+    detect_data_format(args["input_data"], args["format_info"], args["format_report"])
 
 
 if __name__ == "__main__":
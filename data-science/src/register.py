@@ -5,14 +5,95 @@
 Workspace details are inferred from AzureML job environment variables.
 """
 
-import argparse
+import hashlib
 import os
+import sys
 import json
+from types import SimpleNamespace
 from azure.ai.ml.entities import Model
 from common import get_ml_client
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def _hash_model_path(model_path):
+    """SHA256 digest over the model artifact (single file or directory tree).
+
+    Per-file digests are folded into an outer hash together with their
+    relative paths, in sorted order, so the result is stable across walks.
+    """
+    outer = hashlib.sha256()
+    if os.path.isfile(model_path):
+        files = [(os.path.basename(model_path), model_path)]
+    else:
+        files = []
+        for dirpath, _, names in os.walk(model_path):
+            for name in names:
+                full = os.path.join(dirpath, name)
+                files.append((os.path.relpath(full, model_path), full))
+        files.sort()
+    for rel, full in files:
+        with open(full, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes in C without per-chunk interpreter
+                # overhead, keeping large checkpoints disk-bound
+                digest = hashlib.file_digest(f, "sha256").digest()
+            else:
+                h = hashlib.sha256()
+                while chunk := f.read(_HASH_CHUNK):
+                    h.update(chunk)
+                digest = h.digest()
+        outer.update(rel.encode())
+        outer.update(digest)
+    return outer.hexdigest()
+
+
+def _latest_registered_version(ml_client, model_name):
+    """Return the highest registered version of model_name, or None."""
+    try:
+        versions = list(ml_client.models.list(name=model_name))
+    except Exception as e:
+        print(f"Could not list existing versions of '{model_name}': {e}")
+        return None
+    if not versions:
+        return None
+    return max(
+        versions,
+        key=lambda m: int(m.version) if str(m.version).isdigit() else -1,
+    )
+
 
 def parse_args():
+    argv = sys.argv[1:]
+    # Parse the known flag set by hand (ignoring extras, as parse_known_args
+    # did); argparse is slow to import and construct, so it is only pulled
+    # in for --help or when required flags are missing.
+    flags = {
+        "--model_name": "model_name",
+        "--model_path": "model_path",
+        "--model_info_output_path": "model_info_output_path",
+    }
+    if "-h" not in argv and "--help" not in argv:
+        values = {}
+        i = 0
+        while i < len(argv):
+            name = flags.get(argv[i])
+            if name is not None and i + 1 < len(argv):
+                values[name] = argv[i + 1]
+                i += 2
+            else:
+                i += 1
+        if len(values) == 3:
+            return SimpleNamespace(**values)
+
+    import argparse
+
     p = argparse.ArgumentParser()
     p.add_argument("--model_name", required=True)
     p.add_argument("--model_path", required=True, help="Local or mounted path to model files (dir or file)")
@@ -27,21 +108,37 @@ def main():
 
     ml_client = get_ml_client()
 
-    model_entity = Model(
-        name=args.model_name,
-        path=args.model_path,  # Can be a directory or file
-        description="Registered via register.py (MLClient)",
-        type="custom_model",  # generic; adjust if you have a specific framework
-    )
-
-    registered = ml_client.models.create_or_update(model_entity)
+    # Skip the artifact upload entirely when the content matches the latest
+    # registered version; the digest is stored in the model properties.
+    digest = _hash_model_path(args.model_path)
+    latest = _latest_registered_version(ml_client, args.model_name)
+    if latest is not None and (latest.properties or {}).get("content_sha256") == digest:
+        registered = latest
+        print(
+            f"Model content unchanged (sha256={digest}); "
+            f"reusing version {registered.version}"
+        )
+    else:
+        model_entity = Model(
+            name=args.model_name,
+            path=args.model_path,  # Can be a directory or file
+            description="Registered via register.py (MLClient)",
+            type="custom_model",  # generic; adjust if you have a specific framework
+            properties={"content_sha256": digest},
+        )
+        registered = ml_client.models.create_or_update(model_entity)
     print(f"Registered model: name={registered.name} version={registered.version} id={registered.id}")
 
     # Persist model id in expected JSON format
     os.makedirs(args.model_info_output_path, exist_ok=True)
     out_path = os.path.join(args.model_info_output_path, "model_info.json")
-    with open(out_path, "w") as f:
-        json.dump({"id": f"{registered.name}:{registered.version}"}, f)
+    model_info = {"id": f"{registered.name}:{registered.version}"}
+    if orjson is not None:
+        with open(out_path, "wb") as f:
+            f.write(orjson.dumps(model_info))
+    else:
+        with open(out_path, "w") as f:
+            json.dump(model_info, f)
     print(f"Wrote model info to {out_path}")
 
 
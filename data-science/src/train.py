@@ -5,14 +5,53 @@ Assumes the input dataset folder follows YOLO structure with data.yaml inside
 (or user passes a path to one). Saves model artifacts to the provided output dir.
 """
 
-import argparse
 import os
+import sys
 import json
 import logging
+import shutil
+import threading
 from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# Base weights cached here survive job restarts on the same compute, so
+# bare names like "yolov8n.pt" do not trigger a fresh download every run
+WEIGHTS_CACHE_DIR = os.environ.get("YOLO_WEIGHTS_CACHE", "/tmp/yolo_weights")
 
 
 def parse_args():
+    argv = sys.argv[1:]
+    # Parse the known flag set by hand; argparse is slow to import and
+    # construct, so it is only pulled in for --help or malformed input.
+    spec = {
+        "--data": ("data", str),
+        "--epochs": ("epochs", int),
+        "--imgsz": ("imgsz", int),
+        "--model": ("model", str),
+        "--output": ("output", str),
+    }
+    if "-h" not in argv and "--help" not in argv and len(argv) % 2 == 0:
+        values = {"epochs": 10, "imgsz": 640, "model": "yolov8n.pt"}
+        for flag, raw in zip(argv[0::2], argv[1::2]):
+            entry = spec.get(flag)
+            if entry is None:
+                break
+            name, convert = entry
+            try:
+                values[name] = convert(raw)
+            except ValueError:
+                break
+        else:
+            if "data" in values and "output" in values:
+                return SimpleNamespace(**values)
+
+    import argparse
+
     p = argparse.ArgumentParser()
     p.add_argument("--data", required=True, help="Path to YOLO data.yaml")
     p.add_argument("--epochs", type=int, default=10)
@@ -35,17 +74,41 @@ def main():
     )
     logger = logging.getLogger("train")
     logger.info("===== YOLO training script start =====")
-    logger.info("Output directory: %s", args.output)
 
-    # Lazy import so env resolves dependencies at runtime
-    try:
-        from ultralytics import YOLO  # type: ignore
-    except Exception as e:  # pragma: no cover
-        logger.exception(
-            "Failed to import Ultralytics YOLO (is the dependency installed?)"
-        )
-        raise RuntimeError("Ultralytics YOLO not installed in environment") from e
+    # The Ultralytics import is heavy (torch, cv2, numpy) and YOLO() may
+    # download base weights; run both on a background thread so they overlap
+    # with the remaining setup work. Import stays lazy so the env resolves
+    # dependencies at runtime.
+    model_holder = {}
 
+    def _load_model():
+        try:
+            from ultralytics import YOLO  # type: ignore
+
+            # Prefer a previously cached copy of bare weight names so
+            # Ultralytics does not re-download them on every container start
+            weights = args.model
+            cached = os.path.join(WEIGHTS_CACHE_DIR, os.path.basename(weights))
+            if os.sep not in weights and os.path.isfile(cached):
+                weights = cached
+
+            model_holder["model"] = YOLO(weights)
+
+            # Populate the cache if YOLO just downloaded the weights
+            if weights == args.model and os.path.isfile(weights):
+                try:
+                    os.makedirs(WEIGHTS_CACHE_DIR, exist_ok=True)
+                    if not os.path.isfile(cached):
+                        shutil.copy(weights, cached)
+                except OSError:
+                    pass  # cache is best-effort
+        except Exception as e:  # pragma: no cover
+            model_holder["error"] = e
+
+    loader = threading.Thread(target=_load_model, name="yolo-prefetch")
+    loader.start()
+
+    logger.info("Output directory: %s", args.output)
     logger.info(
         "Starting YOLO training | model=%s | data=%s | epochs=%s | imgsz=%s",
         args.model,
@@ -54,7 +117,17 @@ def main():
         args.imgsz,
     )
 
-    model = YOLO(args.model)
+    loader.join()
+    if "error" in model_holder:  # pragma: no cover
+        logger.error(
+            "Failed to load Ultralytics YOLO (is the dependency installed?): %s",
+            model_holder["error"],
+        )
+        raise RuntimeError(
+            "Ultralytics YOLO not available in environment"
+        ) from model_holder["error"]
+
+    model = model_holder["model"]
 
     results = model.train(
         data=args.data,
@@ -72,8 +145,15 @@ def main():
             "imgsz": args.imgsz,
             "best_map50": getattr(results, "best_map50", None),
         }
-        with open(metrics_path, "w") as f:
-            json.dump(metrics_summary, f, indent=2)
+        if orjson is not None:
+            # Single-shot byte write; stays fast if the summary grows
+            # per-epoch metrics later
+            metrics_path.write_bytes(
+                orjson.dumps(metrics_summary, option=orjson.OPT_INDENT_2)
+            )
+        else:
+            with open(metrics_path, "w") as f:
+                json.dump(metrics_summary, f, indent=2)
         logger.info("Metrics saved: %s", metrics_summary)
         logger.info("Saved metrics to %s", metrics_path)
     except Exception as e:  # pragma: no cover
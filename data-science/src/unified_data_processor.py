@@ -6,101 +6,190 @@ Handles both COCO to YOLO conversion and direct YOLO copying in a single compone
 
 import os
 import json
+import hashlib
 import logging
 import shutil
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to whole-file parsing
+    ijson = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; a NumPy kernel covers its absence
+    njit = None
+
+
+if njit is not None:
+
+    # No fastmath: it reorders the arithmetic and flips the last decimal
+    # of some labels, so output would depend on whether numba is present
+    @njit(parallel=True, cache=True)
+    def _coco_to_yolo_kernel(bbox, cat, w, h):
+        n = bbox.shape[0]
+        out = np.empty((n, 5))
+        for i in prange(n):
+            c = cat[i] - 1
+            out[i, 0] = c if c > 0 else 0
+            out[i, 1] = (bbox[i, 0] + bbox[i, 2] * 0.5) / w
+            out[i, 2] = (bbox[i, 1] + bbox[i, 3] * 0.5) / h
+            out[i, 3] = bbox[i, 2] / w
+            out[i, 4] = bbox[i, 3] / h
+        return out
+
+else:
+
+    def _coco_to_yolo_kernel(bbox, cat, w, h):
+        """NumPy fallback matching the jitted kernel above."""
+        centers = bbox[:, :2] + bbox[:, 2:] / 2
+        norm = np.concatenate([centers, bbox[:, 2:]], axis=1) / np.asarray(
+            [w, h, w, h], dtype=np.float64
+        )
+        return np.column_stack((np.maximum(cat - 1, 0), norm))
+
+
+# One YOLO label line; %-formatting runs in C and beats an f-string with
+# five __format__ calls (class ids are non-negative, so %d truncation
+# matches int())
+_FMT_LINE = "%d %.6f %.6f %.6f %.6f".__mod__
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def process_data(
-    input_data: str, detected_format: str, output_data: str, processing_report: str
-):
-    """
-    Process data based on detected format - either convert COCO to YOLO or copy YOLO directly.
+def _loads_json(raw):
+    """Parse JSON bytes/str, preferring orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-    Args:
-        input_data: Input dataset folder path
-        detected_format: Format detection results file path
-        output_data: Output folder path
-        processing_report: Processing report output file
-    """
 
-    logger.info("Starting unified data processing...")
-    logger.info(f"Input data: {input_data}")
-    logger.info(f"Detected format file: {detected_format}")
-    logger.info(f"Output data: {output_data}")
-    logger.info(f"Processing report: {processing_report}")
+def _atomic_write_bytes(path: str, data: bytes):
+    """Write data to path via a sibling tempfile and os.replace.
 
-    # Load format detection results with error handling
-    format_info = {}
+    Readers never observe a partial file even if the process is killed
+    mid-write (preemptible compute), so a crash costs a rerun of this
+    step only, not downstream confusion over truncated output.
+    """
+    tmp = f"{path}.tmp.{os.getpid()}"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        if not os.path.exists(detected_format):
-            logger.warning(f"Format detection file not found: {detected_format}")
-            format_info = {
-                "detected_format": "unknown",
-                "confidence": 0.0,
-                "conversion_needed": True,
-            }
-        else:
-            with open(detected_format, "r") as f:
-                format_info = json.load(f)
-            logger.info(f"Loaded format info: {format_info}")
-    except Exception as e:
-        logger.error(f"Error reading format detection file: {e}")
-        format_info = {
-            "detected_format": "unknown",
-            "confidence": 0.0,
-            "conversion_needed": True,
-        }
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
 
-    input_path = Path(input_data)
-    output_path = Path(output_data)
 
-    # Initialize processing results
+def _write_json(path: str, obj: dict):
+    """Serialize obj to path atomically, preferring orjson when available."""
+    if orjson is not None:
+        payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(obj, indent=2).encode()
+    _atomic_write_bytes(path, payload)
+
+
+def _input_tree_digest(input_path: Path, detected_format_type: str) -> str:
+    """Fingerprint the input tree plus the detected format.
+
+    Hashes (relative path, size, mtime_ns) for every file in sorted order
+    with blake2b; orders of magnitude cheaper than re-converting or
+    re-copying unchanged gigabytes.
+    """
+    root = str(input_path)
+    entries = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    st = entry.stat(follow_symlinks=False)
+                    entries.append(
+                        (os.path.relpath(entry.path, root), st.st_size, st.st_mtime_ns)
+                    )
+    entries.sort()
+    h = hashlib.blake2b(detected_format_type.encode(), digest_size=16)
+    for rel, size, mtime_ns in entries:
+        h.update(rel.encode())
+        h.update(size.to_bytes(8, "little"))
+        h.update(mtime_ns.to_bytes(8, "little", signed=True))
+    return h.hexdigest()
+
+
+def process_data_fast(
+    input_path: Path, detected_format_type: str, output_path: Path
+) -> dict:
+    """Dispatch processing for pre-validated pipeline inputs.
+
+    Fast path for callers that already hold the detected format string and
+    know the input path exists (upstream components guarantee both in the
+    pipeline): no format-file read, no existence checks, no report write.
+    Returns the processing results dict for the caller to persist.
+
+    A .processed_hash sidecar in the output directory fingerprints the
+    input tree and format of the last successful run; when it matches,
+    the previous results are returned without touching the data.
+    """
+    hash_file = output_path / ".processed_hash"
+    prior_results_file = output_path / ".processed_results.json"
+    try:
+        digest = _input_tree_digest(input_path, detected_format_type)
+    except OSError as e:
+        # The cache is best-effort; an unreadable subdirectory must not
+        # kill the run before processing even starts
+        logger.warning("Could not fingerprint input tree: %s", e)
+        digest = None
+    try:
+        if digest is not None and hash_file.read_text() == digest:
+            prior = _loads_json(prior_results_file.read_bytes())
+            logger.info(
+                "Input unchanged since last run (hash %s); skipping processing",
+                digest,
+            )
+            return prior
+    except (OSError, ValueError):
+        pass  # no sidecar yet, or unreadable: process normally
+
     processing_results = {
         "processing_type": "none",
         "success": False,
-        "detected_format": format_info.get("detected_format", "unknown"),
+        "detected_format": detected_format_type,
         "files_processed": 0,
         "errors": [],
         "warnings": [],
         "timestamp": datetime.now().isoformat(),
     }
 
-    # Validate input path
-    if not input_path.exists():
-        logger.error(f"Input path does not exist: {input_path}")
-        processing_results["errors"].append("Input path not found")
-        # Create empty output directory
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Write processing report
-        with open(processing_report, "w") as f:
-            json.dump(processing_results, f, indent=2)
-        return
-
-    # Determine processing type based on detected format
-    detected_format_type = format_info.get("detected_format", "unknown")
-
     if detected_format_type == "coco":
         logger.info("Detected COCO format - performing conversion to YOLO")
         processing_results["processing_type"] = "coco_to_yolo_conversion"
-        success = convert_coco_to_yolo(input_path, output_path, processing_results)
-        processing_results["success"] = success
+        processing_results["success"] = convert_coco_to_yolo(
+            input_path, output_path, processing_results
+        )
 
     elif detected_format_type == "yolo":
         logger.info("Detected YOLO format - copying data directly")
         processing_results["processing_type"] = "yolo_direct_copy"
-        success = copy_yolo_data_directly(input_path, output_path, processing_results)
-        processing_results["success"] = success
+        processing_results["success"] = copy_yolo_data_directly(
+            input_path, output_path, processing_results
+        )
 
     else:
-        logger.warning(f"Unknown or unsupported format: {detected_format_type}")
+        logger.warning("Unknown or unsupported format: %s", detected_format_type)
         processing_results["processing_type"] = "unknown_format"
         processing_results["warnings"].append(
             f"Unsupported format: {detected_format_type}"
@@ -109,18 +198,328 @@ def process_data(
         output_path.mkdir(parents=True, exist_ok=True)
         processing_results["success"] = True  # Not a failure, just no processing needed
 
+    if processing_results["success"] and digest is not None:
+        try:
+            _write_json(str(prior_results_file), processing_results)
+            _atomic_write_bytes(str(hash_file), digest.encode())
+        except OSError as e:
+            logger.warning("Could not write processed-hash sidecar: %s", e)
+
+    return processing_results
+
+
+def process_data(
+    input_data: str,
+    detected_format: str,
+    output_data: str,
+    processing_report: str,
+    *,
+    format_info: dict = None,
+):
+    """
+    Process data based on detected format - either convert COCO to YOLO or copy YOLO directly.
+
+    CLI wrapper around process_data_fast: reads the format detection file,
+    validates the input path and writes the processing report.
+
+    Args:
+        input_data: Input dataset folder path
+        detected_format: Format detection results file path
+        output_data: Output folder path
+        processing_report: Processing report output file
+        format_info: Pre-parsed format detection dict; when given, the
+            detected_format file is not opened at all
+    """
+
+    logger.info("Starting unified data processing...")
+    logger.info("Input data: %s", input_data)
+    logger.info("Detected format file: %s", detected_format)
+    logger.info("Output data: %s", output_data)
+    logger.info("Processing report: %s", processing_report)
+
+    # Load format detection results with error handling, unless the caller
+    # already holds the parsed dict (chained Python calls, tests)
+    if format_info is None:
+        format_info = {}
+        try:
+            if not os.path.exists(detected_format):
+                logger.warning("Format detection file not found: %s", detected_format)
+                format_info = {
+                    "detected_format": "unknown",
+                    "confidence": 0.0,
+                    "conversion_needed": True,
+                }
+            else:
+                with open(detected_format, "rb") as f:
+                    format_info = _loads_json(f.read())
+                logger.info("Loaded format info: %s", format_info)
+        except Exception as e:
+            logger.error("Error reading format detection file: %s", e)
+            format_info = {
+                "detected_format": "unknown",
+                "confidence": 0.0,
+                "conversion_needed": True,
+            }
+
+    input_path = Path(input_data)
+    output_path = Path(output_data)
+
+    # Validate input path
+    if not input_path.exists():
+        logger.error("Input path does not exist: %s", input_path)
+        processing_results = {
+            "processing_type": "none",
+            "success": False,
+            "detected_format": format_info.get("detected_format", "unknown"),
+            "files_processed": 0,
+            "errors": ["Input path not found"],
+            "warnings": [],
+            "timestamp": datetime.now().isoformat(),
+        }
+        # Create empty output directory
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        # Write processing report
+        _write_json(processing_report, processing_results)
+        return
+
+    processing_results = process_data_fast(
+        input_path, format_info.get("detected_format", "unknown"), output_path
+    )
+
     # Write processing report
     try:
         os.makedirs(os.path.dirname(processing_report), exist_ok=True)
-        with open(processing_report, "w") as f:
-            json.dump(processing_results, f, indent=2)
-        logger.info(f"Processing report written to: {processing_report}")
+        _write_json(processing_report, processing_results)
+        logger.info("Processing report written to: %s", processing_report)
     except Exception as e:
-        logger.error(f"Failed to write processing report: {e}")
+        logger.error("Failed to write processing report: %s", e)
 
     logger.info("Unified data processing completed")
 
 
+def _iter_ijson_items(json_file, prefix):
+    with open(json_file, "rb") as f:
+        yield from ijson.items(f, prefix)
+
+
+def _build_image_index(images):
+    """Pack image metadata into struct-of-arrays form.
+
+    Returns (id_to_idx, filenames, widths, heights): a dict mapping image
+    id to a dense row index, a filename list, and int32 width/height
+    arrays. Compared to a dict-of-dicts this drops one dict plus a handful
+    of string keys per image, and the hot loop indexes flat arrays instead
+    of chasing hashes.
+    """
+    id_to_idx = {}
+    filenames = []
+    widths = []
+    heights = []
+    for img in images:
+        id_to_idx[img["id"]] = len(filenames)
+        filenames.append(img["file_name"])
+        widths.append(img.get("width", 640))
+        heights.append(img.get("height", 480))
+    return (
+        id_to_idx,
+        filenames,
+        np.asarray(widths, dtype=np.int32),
+        np.asarray(heights, dtype=np.int32),
+    )
+
+
+def _open_coco(json_file):
+    """Index a COCO file and return (categories, image_index, annotations).
+
+    With ijson installed, categories and images are streamed without ever
+    loading the annotation array, and the returned annotation iterator
+    yields objects one at a time; peak memory stays at the size of the
+    image index rather than the whole JSON. Without ijson the file is
+    parsed once in full. image_index is built by _build_image_index and
+    has an empty id map when the file is not COCO-shaped.
+    """
+    categories = {}
+
+    if ijson is not None:
+        for cat in _iter_ijson_items(json_file, "categories.item"):
+            categories[cat["id"]] = cat["name"]
+        image_index = _build_image_index(_iter_ijson_items(json_file, "images.item"))
+        return (
+            categories,
+            image_index,
+            _iter_ijson_items(json_file, "annotations.item"),
+        )
+
+    with open(json_file, "rb") as f:
+        coco_data = _loads_json(f.read())
+    if not isinstance(coco_data, dict) or "images" not in coco_data:
+        return categories, _build_image_index(()), iter(())
+    for cat in coco_data.get("categories", []):
+        categories[cat["id"]] = cat["name"]
+    return (
+        categories,
+        _build_image_index(coco_data["images"]),
+        iter(coco_data.get("annotations", [])),
+    )
+
+
+def _count_entries(root) -> int:
+    """Count all entries under root with a scandir stack.
+
+    Cheaper than len(list(rglob('*'))), which builds a Path object per
+    entry just to take the length.
+    """
+    count = 0
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                count += 1
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return count
+
+
+_IMG_EXTS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"})
+
+
+def _iter_images(root: Path):
+    """Yield image paths under root in one scandir pass.
+
+    Replaces the per-extension glob pairs, which walked the tree twice per
+    extension and double-counted top-level files. Extensions are matched
+    case-insensitively against _IMG_EXTS via rfind + slice, so Photo.JPG
+    is found on case-sensitive filesystems and no splitext tuples are
+    allocated.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                name = entry.name
+                i = name.rfind(".")
+                if i > 0 and name[i:].lower() in _IMG_EXTS:
+                    yield Path(entry.path)
+
+
+def _copy_image(src: Path, dst: Path):
+    """Copy one file, using in-kernel copy_file_range when available."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            size = os.stat(src).st_size
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    remaining = size
+                    while remaining > 0:
+                        n = os.copy_file_range(src_fd, dst_fd, remaining)
+                        if n == 0:
+                            break
+                        remaining -= n
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # e.g. EXDEV across filesystems on older kernels
+            pass
+    shutil.copy2(src, dst)
+
+
+def _process_one_coco(json_file: Path, labels_dir: Path):
+    """Convert one COCO file's annotations into YOLO label files.
+
+    Kept at module level so it can run in a worker process. Returns
+    (files_written, annotations_converted, categories, errors) for the
+    caller to merge.
+    """
+    files_written = 0
+    converted = 0
+    categories = {}
+    errors = []
+    try:
+        categories, image_index, ann_iter = _open_coco(json_file)
+        id_to_idx, filenames, widths, heights = image_index
+        if not id_to_idx:
+            return files_written, converted, categories, errors
+
+        # Extract the three needed fields in one comprehension pass; the
+        # membership checks run at comprehension speed rather than in a
+        # Python loop body, and on well-formed files they always pass
+        records = [
+            (ann["image_id"], ann["category_id"], ann["bbox"])
+            for ann in ann_iter
+            if "bbox" in ann and "category_id" in ann
+        ]
+
+        # Group per image, then convert each image's boxes with one NumPy
+        # broadcast instead of five Python ops per annotation
+        boxes_by_image = {}
+        cats_by_image = {}
+        for img_id, cat_id, bbox in records:
+            idx = id_to_idx.get(img_id)
+            if idx is None:
+                continue
+            boxes_by_image.setdefault(idx, []).append(bbox)
+            cats_by_image.setdefault(idx, []).append(cat_id)
+
+        # Label paths are built with plain string ops; two Path
+        # constructions per image add up on annotation-heavy datasets
+        labels_dir_str = str(labels_dir) + os.sep
+
+        for idx, bboxes in boxes_by_image.items():
+            # COCO bbox format: [x, y, width, height] per row
+            bbox = np.asarray(bboxes, dtype=np.float64)
+            cats = np.asarray(cats_by_image[idx], dtype=np.int32)
+
+            # Convert to YOLO format (normalized center coordinates with
+            # 0-based class ids); the kernel is jitted when numba is present
+            out = _coco_to_yolo_kernel(
+                bbox,
+                cats,
+                float(widths[idx]),
+                float(heights[idx]),
+            )
+
+            # Basename and stem via rfind/rsplit, matching Path(...).stem
+            # for COCO file_names that carry a subdirectory prefix
+            name = filenames[idx]
+            slash = name.rfind("/")
+            if slash >= 0:
+                name = name[slash + 1 :]
+            yolo_path = labels_dir_str + name.rsplit(".", 1)[0] + ".txt"
+
+            # Assemble the whole file as one ASCII payload and push it with
+            # a raw open/write/close, skipping Python's text-IO layering and
+            # per-line encoding; open/fstat/close dominate these tiny files
+            lines = [_FMT_LINE(tuple(row)) for row in out.tolist()]
+            payload = ("\n".join(lines) + "\n").encode("ascii")
+            fd = os.open(
+                yolo_path,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0),
+                0o644,
+            )
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+            converted += len(bboxes)
+            files_written += 1
+
+    except Exception as e:
+        logger.warning("Error processing COCO file %s: %s", json_file, e)
+        errors.append(f"COCO processing error in {json_file.name}: {str(e)}")
+    return files_written, converted, categories, errors
+
+
 def convert_coco_to_yolo(input_path: Path, output_path: Path, results: dict) -> bool:
     """Convert COCO format to YOLO format."""
     try:
@@ -138,135 +537,80 @@ def convert_coco_to_yolo(input_path: Path, output_path: Path, results: dict) ->
             results["warnings"].append("No JSON files found")
             return True  # Not an error, just no data to process
 
-        logger.info(f"Found {len(coco_files)} JSON files to process")
+        logger.info("Found %d JSON files to process", len(coco_files))
 
-        # Process COCO annotation files
+        # Process COCO annotation files. Each file is independent, so fan
+        # out across cores; parsing and the bbox math bypass the GIL in
+        # separate processes.
         all_categories = {}
         converted_annotations = 0
 
-        for json_file in coco_files:
-            try:
-                with open(json_file, "r") as f:
-                    coco_data = json.load(f)
-
-                if not isinstance(coco_data, dict) or "images" not in coco_data:
-                    continue
-
-                # Build category mapping
-                if "categories" in coco_data:
-                    for cat in coco_data["categories"]:
-                        all_categories[cat["id"]] = cat["name"]
-
-                # Create image filename to ID mapping
-                image_mapping = {}
-                if "images" in coco_data:
-                    for img in coco_data["images"]:
-                        image_mapping[img["id"]] = {
-                            "filename": img["file_name"],
-                            "width": img.get("width", 640),
-                            "height": img.get("height", 480),
-                        }
-
-                # Process annotations
-                if "annotations" in coco_data:
-                    # Group annotations by image
-                    annotations_by_image = {}
-                    for ann in coco_data["annotations"]:
-                        img_id = ann["image_id"]
-                        if img_id not in annotations_by_image:
-                            annotations_by_image[img_id] = []
-                        annotations_by_image[img_id].append(ann)
-
-                    # Convert annotations to YOLO format
-                    for img_id, annotations in annotations_by_image.items():
-                        if img_id not in image_mapping:
-                            continue
-
-                        img_info = image_mapping[img_id]
-                        img_width = img_info["width"]
-                        img_height = img_info["height"]
-                        filename = img_info["filename"]
-
-                        # Create YOLO annotation file
-                        yolo_filename = Path(filename).stem + ".txt"
-                        yolo_path = labels_dir / yolo_filename
-
-                        yolo_lines = []
-                        for ann in annotations:
-                            if "bbox" not in ann or "category_id" not in ann:
-                                continue
-
-                            # COCO bbox format: [x, y, width, height]
-                            bbox = ann["bbox"]
-                            x, y, w, h = bbox
-
-                            # Convert to YOLO format (normalized center coordinates)
-                            x_center = (x + w / 2) / img_width
-                            y_center = (y + h / 2) / img_height
-                            norm_width = w / img_width
-                            norm_height = h / img_height
-
-                            # YOLO class ID (0-based)
-                            class_id = (
-                                ann["category_id"] - 1 if ann["category_id"] > 0 else 0
-                            )
-
-                            yolo_lines.append(
-                                f"{class_id} {x_center:.6f} {y_center:.6f} {norm_width:.6f} {norm_height:.6f}"
-                            )
-                            converted_annotations += 1
-
-                        # Write YOLO annotation file
-                        with open(yolo_path, "w") as f:
-                            f.write("\n".join(yolo_lines))
-
-                        results["files_processed"] += 1
-
-            except Exception as e:
-                logger.warning(f"Error processing COCO file {json_file}: {e}")
-                results["errors"].append(
-                    f"COCO processing error in {json_file.name}: {str(e)}"
+        if len(coco_files) > 1 and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                partials = list(
+                    executor.map(
+                        _process_one_coco,
+                        coco_files,
+                        [labels_dir] * len(coco_files),
+                    )
                 )
+        else:
+            partials = [_process_one_coco(p, labels_dir) for p in coco_files]
+
+        for files_written, converted, categories, errors in partials:
+            results["files_processed"] += files_written
+            converted_annotations += converted
+            all_categories.update(categories)
+            results["errors"].extend(errors)
 
         # Copy image files
-        image_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"}
-        image_files = []
-        for ext in image_extensions:
-            image_files.extend(input_path.glob(f"*{ext}"))
-            image_files.extend(input_path.glob(f"**/*{ext}"))
+        image_files = list(_iter_images(input_path))
 
+        # Copies are I/O-bound; threads release the GIL during the kernel
+        # copy, so one slow file no longer stalls the rest
         copied_images = 0
-        for img_file in image_files:
-            try:
-                shutil.copy2(img_file, images_dir / img_file.name)
-                copied_images += 1
-            except Exception as e:
-                logger.warning(f"Error copying image {img_file}: {e}")
-
-        # Create classes.txt file
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_copy_image, img_file, images_dir / img_file.name)
+                for img_file in image_files
+            ]
+            for img_file, future in zip(image_files, futures):
+                try:
+                    future.result()
+                    copied_images += 1
+                except Exception as e:
+                    logger.warning("Error copying image %s: %s", img_file, e)
+
+        # Create classes.txt file (atomically, so a preempted run never
+        # leaves a truncated class list behind)
         classes_file = output_path / "classes.txt"
-        with open(classes_file, "w") as f:
-            if all_categories:
-                # Write categories in order of their IDs
-                sorted_categories = sorted(all_categories.items())
-                for cat_id, cat_name in sorted_categories:
-                    f.write(f"{cat_name}\n")
-            else:
-                # Default class if no categories found
-                f.write("object\n")
+        if all_categories:
+            # Write categories in ID order via a list indexed by ID;
+            # COCO ids are dense small ints, so this beats sorting
+            cats = [None] * (max(all_categories) + 1)
+            for cat_id, cat_name in all_categories.items():
+                cats[cat_id] = cat_name
+            payload = "".join(
+                f"{cat_name}\n" for cat_name in cats if cat_name is not None
+            )
+        else:
+            # Default class if no categories found
+            payload = "object\n"
+        _atomic_write_bytes(str(classes_file), payload.encode())
 
         results["annotations_converted"] = converted_annotations
         results["images_copied"] = copied_images
 
-        logger.info(f"✅ COCO to YOLO conversion completed!")
-        logger.info(f"   - Processed {results['files_processed']} annotation files")
-        logger.info(f"   - Converted {converted_annotations} annotations")
-        logger.info(f"   - Copied {copied_images} images")
+        logger.info("✅ COCO to YOLO conversion completed!")
+        logger.info("   - Processed %d annotation files", results["files_processed"])
+        logger.info("   - Converted %d annotations", converted_annotations)
+        logger.info("   - Copied %d images", copied_images)
 
         return True
 
     except Exception as e:
-        logger.error(f"Error during COCO to YOLO conversion: {e}")
+        logger.error("Error during COCO to YOLO conversion: %s", e)
         results["errors"].append(f"Conversion error: {str(e)}")
         # Create empty output to continue pipeline
         output_path.mkdir(parents=True, exist_ok=True)
@@ -281,16 +625,38 @@ def copy_yolo_data_directly(input_path: Path, output_path: Path, results: dict)
         # Copy the entire input directory to output
         if output_path.exists():
             shutil.rmtree(output_path)
-        shutil.copytree(input_path, output_path)
+
+        # When input and output share a filesystem, clone via hardlinks:
+        # O(number of files) metadata operations instead of re-writing every
+        # byte, and no duplicated disk usage
+        copy_function = shutil.copy2
+        try:
+            if os.stat(input_path).st_dev == os.stat(output_path.parent).st_dev:
+                copy_function = os.link
+        except OSError:
+            pass
+
+        try:
+            shutil.copytree(input_path, output_path, copy_function=copy_function)
+        except Exception:
+            if copy_function is os.link:
+                # Some filesystems refuse links (permissions, mount options);
+                # redo with full byte copies
+                logger.warning("Hardlink clone failed; falling back to byte copy")
+                if output_path.exists():
+                    shutil.rmtree(output_path)
+                shutil.copytree(input_path, output_path)
+            else:
+                raise
 
         # Verify the copy was successful
         try:
-            input_files = len(list(input_path.rglob("*")))
-            output_files = len(list(output_path.rglob("*")))
+            input_files = _count_entries(input_path)
+            output_files = _count_entries(output_path)
 
-            logger.info(f"✅ Successfully copied YOLO data to {output_path}")
-            logger.info(f"   - Input files: {input_files}")
-            logger.info(f"   - Output files: {output_files}")
+            logger.info("✅ Successfully copied YOLO data to %s", output_path)
+            logger.info("   - Input files: %d", input_files)
+            logger.info("   - Output files: %d", output_files)
 
             results["files_processed"] = input_files
             results["files_copied"] = output_files
@@ -304,7 +670,7 @@ def copy_yolo_data_directly(input_path: Path, output_path: Path, results: dict)
                 )
 
         except Exception as verify_error:
-            logger.warning(f"Could not verify file counts: {verify_error}")
+            logger.warning("Could not verify file counts: %s", verify_error)
             results["warnings"].append(
                 f"Could not verify file counts: {str(verify_error)}"
             )
@@ -312,7 +678,7 @@ def copy_yolo_data_directly(input_path: Path, output_path: Path, results: dict)
         return True
 
     except Exception as e:
-        logger.error(f"Error copying YOLO data: {e}")
+        logger.error("Error copying YOLO data: %s", e)
         results["errors"].append(f"Copy error: {str(e)}")
         # Create empty output directory to prevent pipeline failure
         output_path.mkdir(parents=True, exist_ok=True)